@@ -143,8 +143,20 @@ class AnsibleSubnetSearchException(AnsibleRouteTableException):
     pass
 
 CIDR_RE = re.compile('^(\d{1,3}\.){3}\d{1,3}\/\d{1,2}$')
-SUBNET_RE = re.compile('^subnet-[A-z0-9]+$')
+SUBNET_RE = re.compile('^subnet-[A-Za-z0-9]+$')
 ROUTE_TABLE_RE = re.compile('^rtb-[A-z0-9]+$')
+ROUTE_KEYS = ('destination_cidr_block', 'gateway_id', 'instance_id',
+              'interface_id', 'vpc_peering_connection_id')
+ROUTE_TABLE_ARGUMENT_SPEC = dict(
+    lookup = dict(default='tag', required=False, choices=['tag', 'id']),
+    propagating_vgw_ids = dict(default=None, required=False, type='list'),
+    route_table_id = dict(default=None, required=False),
+    routes = dict(default=[], required=False, type='list'),
+    state = dict(default='present', choices=['present', 'absent']),
+    subnets = dict(default=None, required=False, type='list'),
+    tags = dict(default=None, required=False, type='dict', aliases=['resource_tags']),
+    vpc_id = dict(default=None, required=True)
+)
 
 
 def find_subnets(vpc_conn, vpc_id, identified_subnets):
@@ -159,48 +171,49 @@ def find_subnets(vpc_conn, vpc_id, identified_subnets):
     subnet_names = []
     subnet_cidrs = []
     for subnet in (identified_subnets or []):
-        if re.match(SUBNET_RE, subnet):
+        if SUBNET_RE.match(subnet):
             subnet_ids.append(subnet)
-        elif re.match(CIDR_RE, subnet):
+        elif CIDR_RE.match(subnet):
             subnet_cidrs.append(subnet)
         else:
             subnet_names.append(subnet)
 
-    subnets_by_id = []
-    if subnet_ids:
-        subnets_by_id = vpc_conn.get_all_subnets(
-            subnet_ids, filters={'vpc_id': vpc_id})
-
-        for subnet_id in subnet_ids:
-            if not any(s.id == subnet_id for s in subnets_by_id):
-                raise AnsibleSubnetSearchException(
-                    'Subnet ID "{0}" does not exist'.format(subnet_id))
-
-    subnets_by_cidr = []
-    if subnet_cidrs:
-        subnets_by_cidr = vpc_conn.get_all_subnets(
-            filters={'vpc_id': vpc_id, 'cidr': subnet_cidrs})
-
-        for cidr in subnet_cidrs:
-            if not any(s.cidr_block == cidr for s in subnets_by_cidr):
-                raise AnsibleSubnetSearchException(
-                    'Subnet CIDR "{0}" does not exist'.format(cidr))
-
-    subnets_by_name = []
-    if subnet_names:
-        subnets_by_name = vpc_conn.get_all_subnets(
-            filters={'vpc_id': vpc_id, 'tag:Name': subnet_names})
-
-        for name in subnet_names:
-            matching_count = len([1 for s in subnets_by_name if s.tags.get('Name') == name])
-            if matching_count == 0:
-                raise AnsibleSubnetSearchException(
-                    'Subnet named "{0}" does not exist'.format(name))
-            elif matching_count > 1:
-                raise AnsibleSubnetSearchException(
-                    'Multiple subnets named "{0}"'.format(name))
-
-    return subnets_by_id + subnets_by_cidr + subnets_by_name
+    if not (subnet_ids or subnet_cidrs or subnet_names):
+        return []
+
+    # Fetch every subnet in the VPC with a single call and resolve the
+    # identifiers locally, rather than issuing one describe per kind.
+    vpc_subnets = vpc_conn.get_all_subnets(filters={'vpc_id': vpc_id})
+    subnets_by_id = dict((s.id, s) for s in vpc_subnets)
+    subnets_by_cidr = dict((s.cidr_block, s) for s in vpc_subnets)
+    subnets_by_name = {}
+    for s in vpc_subnets:
+        subnets_by_name.setdefault(s.tags.get('Name'), []).append(s)
+
+    subnets = []
+    for subnet_id in subnet_ids:
+        if subnet_id not in subnets_by_id:
+            raise AnsibleSubnetSearchException(
+                'Subnet ID "{0}" does not exist'.format(subnet_id))
+        subnets.append(subnets_by_id[subnet_id])
+
+    for cidr in subnet_cidrs:
+        if cidr not in subnets_by_cidr:
+            raise AnsibleSubnetSearchException(
+                'Subnet CIDR "{0}" does not exist'.format(cidr))
+        subnets.append(subnets_by_cidr[cidr])
+
+    for name in subnet_names:
+        matching = subnets_by_name.get(name, [])
+        if len(matching) == 0:
+            raise AnsibleSubnetSearchException(
+                'Subnet named "{0}" does not exist'.format(name))
+        elif len(matching) > 1:
+            raise AnsibleSubnetSearchException(
+                'Multiple subnets named "{0}"'.format(name))
+        subnets.append(matching[0])
+
+    return subnets
 
 
 def find_igw(vpc_conn, vpc_id):
@@ -236,21 +249,39 @@ def tags_match(match_tags, candidate_tags):
                 for k, v in match_tags.items()))
 
 
-def ensure_tags(vpc_conn, resource_id, tags, add_only, check_mode):
+def ensure_tags(vpc_conn, resource_id, tags, add_only, check_mode,
+                cur_tags=None):
     try:
-        cur_tags = get_resource_tags(vpc_conn, resource_id)
+        if cur_tags is None:
+            cur_tags = get_resource_tags(vpc_conn, resource_id)
         if tags == cur_tags:
             return {'changed': False, 'tags': cur_tags}
 
-        to_delete = dict((k, cur_tags[k]) for k in cur_tags if k not in tags)
-        if to_delete and not add_only:
-            vpc_conn.delete_tags(resource_id, to_delete, dry_run=check_mode)
+        # Split the current tags into those kept and those to delete in a
+        # single pass; the kept ones become the basis of the resulting tags.
+        latest_tags = {}
+        to_delete = {}
+        for k, v in cur_tags.items():
+            if add_only or k in tags:
+                latest_tags[k] = v
+            else:
+                to_delete[k] = v
+        # create_tags overwrites existing values, so changed values are added.
+        to_add = dict((k, v) for k, v in tags.items()
+                      if k not in cur_tags or cur_tags[k] != v)
+        if not to_delete and not to_add:
+            return {'changed': False, 'tags': cur_tags}
 
-        to_add = dict((k, tags[k]) for k in tags if k not in cur_tags)
-        if to_add:
-            vpc_conn.create_tags(resource_id, to_add, dry_run=check_mode)
+        try:
+            if to_delete:
+                vpc_conn.delete_tags(resource_id, to_delete, dry_run=check_mode)
+            if to_add:
+                vpc_conn.create_tags(resource_id, to_add, dry_run=check_mode)
+        except EC2ResponseError as e:
+            if e.error_code != 'DryRunOperation':
+                raise
 
-        latest_tags = get_resource_tags(vpc_conn, resource_id)
+        latest_tags.update(to_add)
         return {'changed': True, 'tags': latest_tags}
     except EC2ResponseError as e:
         raise AnsibleTagCreationException(
@@ -272,8 +303,9 @@ def get_route_table_by_tags(vpc_conn, vpc_id, tags):
     route_table = None
     route_tables = vpc_conn.get_all_route_tables(filters={'vpc_id': vpc_id})
     for table in route_tables:
-        this_tags = get_resource_tags(vpc_conn, table.id)
-        if tags_match(tags, this_tags):
+        # Tags are returned as part of DescribeRouteTables, so there is no
+        # need for a separate get_all_tags call per route table.
+        if tags_match(tags, table.tags):
             route_table = table
             count +=1
 
@@ -284,14 +316,6 @@ def get_route_table_by_tags(vpc_conn, vpc_id, tags):
 
 
 def route_spec_matches_route(route_spec, route):
-    key_attr_map = {
-        'destination_cidr_block': 'destination_cidr_block',
-        'gateway_id': 'gateway_id',
-        'instance_id': 'instance_id',
-        'interface_id': 'interface_id',
-        'vpc_peering_connection_id': 'vpc_peering_connection_id',
-    }
-
     # This is a workaround to catch managed NAT gateways as they do not show
     # up in any of the returned values when describing route tables.
     # The caveat of doing it this way is that if there was an existing
@@ -303,7 +327,7 @@ def route_spec_matches_route(route_spec, route):
             if all((not route.gateway_id, not route.instance_id, not route.interface_id, not route.vpc_peering_connection_id)):
                 return True
 
-    for k in key_attr_map:
+    for k in ROUTE_KEYS:
         if k in route_spec:
             if route_spec[k] != getattr(route, k):
                 return False
@@ -315,22 +339,25 @@ def rename_key(d, old_key, new_key):
     del d[old_key]
 
 
-def index_of_matching_route(route_spec, routes_to_match):
-    for i, route in enumerate(routes_to_match):
-        if route_spec_matches_route(route_spec, route):
-            return i
-
-
 def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
                   check_mode):
-    routes_to_match = list(route_table.routes)
+    propagating_vgw_ids = frozenset(propagating_vgw_ids or ())
+
+    # A route table holds at most one route per destination, so index the
+    # existing routes by CIDR and only compare a spec against its candidate.
+    # boto only reads destinationCidrBlock, so routes to a prefix list or to
+    # an IPv6 destination come back without one; they cannot be addressed by
+    # delete_route and are left untouched.
+    routes_to_match = dict((r.destination_cidr_block, r)
+                           for r in route_table.routes
+                           if r.destination_cidr_block is not None)
     route_specs_to_create = []
     for route_spec in route_specs:
-        i = index_of_matching_route(route_spec, routes_to_match)
-        if i is None:
-            route_specs_to_create.append(route_spec)
+        route = routes_to_match.get(route_spec['destination_cidr_block'])
+        if route is not None and route_spec_matches_route(route_spec, route):
+            del routes_to_match[route_spec['destination_cidr_block']]
         else:
-            del routes_to_match[i]
+            route_specs_to_create.append(route_spec)
 
     # NOTE: As of boto==2.38.0, the origin of a route is not available
     # (for example, whether it came from a gateway with route propagation
@@ -339,24 +366,26 @@ def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
     # The current logic will leave non-propagated routes using propagating
     # VGWs in place.
     routes_to_delete = []
-    for r in routes_to_match:
+    for r in routes_to_match.values():
         if r.gateway_id:
             if r.gateway_id != 'local' and not r.gateway_id.startswith('vpce-'):
-                if not propagating_vgw_ids or r.gateway_id not in propagating_vgw_ids:
+                if r.gateway_id not in propagating_vgw_ids:
                     routes_to_delete.append(r)
         else:
             routes_to_delete.append(r)
 
     changed = bool(routes_to_delete or route_specs_to_create)
     if changed:
+        errors = []
         for route in routes_to_delete:
             try:
                 vpc_conn.delete_route(route_table.id,
                                       route.destination_cidr_block,
                                       dry_run=check_mode)
             except EC2ResponseError as e:
-                if e.error_code == 'DryRunOperation':
-                    pass
+                if e.error_code != 'DryRunOperation':
+                    errors.append('Unable to delete route {0}, error: {1}'
+                                  .format(route.destination_cidr_block, e))
 
         for route_spec in route_specs_to_create:
             try:
@@ -364,28 +393,44 @@ def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
                                       dry_run=check_mode,
                                       **route_spec)
             except EC2ResponseError as e:
-                if e.error_code == 'DryRunOperation':
-                    pass
+                if e.error_code != 'DryRunOperation':
+                    errors.append('Unable to create route {0}, error: {1}'
+                                  .format(route_spec['destination_cidr_block'], e))
+
+        if errors:
+            raise AnsibleRouteTableException(
+                'Unable to update routes for route table {0}: {1}'
+                .format(route_table.id, '; '.join(errors)))
 
     return {'changed': bool(changed)}
 
 
-def ensure_subnet_association(vpc_conn, vpc_id, route_table_id, subnet_id,
-                              check_mode):
-    route_tables = vpc_conn.get_all_route_tables(
-        filters={'association.subnet_id': subnet_id, 'vpc_id': vpc_id}
-    )
-    for route_table in route_tables:
+def get_subnet_associations(vpc_conn, vpc_id):
+    """
+    Returns a dict mapping each explicitly associated subnet ID in the VPC to
+    a (route_table_id, association_id) tuple.
+    """
+    subnet_associations = {}
+    for route_table in vpc_conn.get_all_route_tables(filters={'vpc_id': vpc_id}):
         if route_table.id is None:
             continue
         for a in route_table.associations:
-            if a.subnet_id == subnet_id:
-                if route_table.id == route_table_id:
-                    return {'changed': False, 'association_id': a.id}
-                else:
-                    if check_mode:
-                        return {'changed': True}
-                    vpc_conn.disassociate_route_table(a.id)
+            if a.subnet_id:
+                subnet_associations[a.subnet_id] = (route_table.id, a.id)
+    return subnet_associations
+
+
+def ensure_subnet_association(vpc_conn, route_table_id, subnet_id,
+                              subnet_associations, check_mode):
+    if subnet_id in subnet_associations:
+        current_route_table_id, association_id = subnet_associations[subnet_id]
+        if current_route_table_id == route_table_id:
+            return {'changed': False, 'association_id': association_id}
+        if check_mode:
+            return {'changed': True}
+        vpc_conn.disassociate_route_table(association_id)
+    elif check_mode:
+        return {'changed': True}
 
     association_id = vpc_conn.associate_route_table(route_table_id, subnet_id)
     return {'changed': True, 'association_id': association_id}
@@ -394,14 +439,32 @@ def ensure_subnet_association(vpc_conn, vpc_id, route_table_id, subnet_id,
 def ensure_subnet_associations(vpc_conn, vpc_id, route_table, subnets,
                                check_mode):
     current_association_ids = [a.id for a in route_table.associations]
+    current_subnet_associations = dict((a.subnet_id, a.id) for a in
+                                       route_table.associations if a.subnet_id)
+    subnet_associations = None
     new_association_ids = []
     changed = False
     for subnet in subnets:
+        # Subnets already associated with this route table need no lookup.
+        if subnet.id in current_subnet_associations:
+            new_association_ids.append(current_subnet_associations[subnet.id])
+            continue
+
+        # Describe the VPC's associations once, on the first subnet that
+        # needs them, rather than once per subnet.
+        if subnet_associations is None:
+            subnet_associations = get_subnet_associations(vpc_conn, vpc_id)
+
         result = ensure_subnet_association(
-            vpc_conn, vpc_id, route_table.id, subnet.id, check_mode)
+            vpc_conn, route_table.id, subnet.id, subnet_associations,
+            check_mode)
         changed = changed or result['changed']
         if changed and check_mode:
             return {'changed': True}
+        # Record the association so a subnet listed more than once (e.g. by
+        # ID and by CIDR) is not associated again against stale data.
+        current_subnet_associations[subnet.id] = result['association_id']
+        subnet_associations[subnet.id] = (route_table.id, result['association_id'])
         new_association_ids.append(result['association_id'])
 
     to_delete = [a_id for a_id in current_association_ids
@@ -423,15 +486,26 @@ def ensure_propagation(vpc_conn, route_table, propagating_vgw_ids,
     # propagated routes using the gateway in the route table. If such a route
     # is found, propagation is almost certainly enabled.
     changed = False
+    errors = []
+    gateway_ids = frozenset(r.gateway_id for r in route_table.routes)
     for vgw_id in propagating_vgw_ids:
-        for r in list(route_table.routes):
-            if r.gateway_id == vgw_id:
-                return {'changed': False}
+        if vgw_id in gateway_ids:
+            continue
 
         changed = True
-        vpc_conn.enable_vgw_route_propagation(route_table.id,
-                                              vgw_id,
-                                              dry_run=check_mode)
+        try:
+            vpc_conn.enable_vgw_route_propagation(route_table.id,
+                                                  vgw_id,
+                                                  dry_run=check_mode)
+        except EC2ResponseError as e:
+            if e.error_code != 'DryRunOperation':
+                errors.append('Unable to enable propagation from {0}, error: {1}'
+                              .format(vgw_id, e))
+
+    if errors:
+        raise AnsibleRouteTableException(
+            'Unable to update route propagation for route table {0}: {1}'
+            .format(route_table.id, '; '.join(errors)))
 
     return {'changed': changed}
 
@@ -492,11 +566,14 @@ def get_route_table_info(route_table):
 def create_route_spec(connection, module, vpc_id):
     routes = module.params.get('routes')
 
+    # The VPC's IGW cannot change mid-run, so look it up at most once.
+    igw = None
     for route_spec in routes:
         rename_key(route_spec, 'dest', 'destination_cidr_block')
 
         if route_spec.get('gateway_id') and route_spec['gateway_id'].lower() == 'igw':
-            igw = find_igw(connection, vpc_id)
+            if igw is None:
+                igw = find_igw(connection, vpc_id)
             route_spec['gateway_id'] = igw
 
     return routes
@@ -522,6 +599,7 @@ def ensure_route_table_present(connection, module):
         if tags is not None:
             try:
                 route_table = get_route_table_by_tags(connection, vpc_id, tags)
+                tags_valid = route_table is not None
             except EC2ResponseError as e:
                 module.fail_json(msg=e.message)
             except RuntimeError as e:
@@ -559,8 +637,10 @@ def ensure_route_table_present(connection, module):
         changed = changed or result['changed']
 
     if not tags_valid and tags is not None:
+        # The route table was described above, so its tags are already known.
         result = ensure_tags(connection, route_table.id, tags,
-                             add_only=True, check_mode=module.check_mode)
+                             add_only=True, check_mode=module.check_mode,
+                             cur_tags=route_table.tags)
         changed = changed or result['changed']
 
     if subnets:
@@ -587,18 +667,7 @@ def ensure_route_table_present(connection, module):
 
 def main():
     argument_spec = ec2_argument_spec()
-    argument_spec.update(
-        dict(
-            lookup = dict(default='tag', required=False, choices=['tag', 'id']),
-            propagating_vgw_ids = dict(default=None, required=False, type='list'),
-            route_table_id = dict(default=None, required=False),
-            routes = dict(default=[], required=False, type='list'),
-            state = dict(default='present', choices=['present', 'absent']),
-            subnets = dict(default=None, required=False, type='list'),
-            tags = dict(default=None, required=False, type='dict', aliases=['resource_tags']),
-            vpc_id = dict(default=None, required=True)
-        )
-    )
+    argument_spec.update(ROUTE_TABLE_ARGUMENT_SPEC)
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
@@ -149,26 +149,30 @@ def alarm(module, state, label, entity_id, check_id, notification_plan_id, crite
                 (criteria and criteria != alarm.criteria)
 
             if should_update and not should_delete:
-                cm.update_alarm(entity=entity_id, alarm=alarm,
-                                criteria=criteria, disabled=disabled,
-                                label=label, metadata=metadata)
+                if not module.check_mode:
+                    cm.update_alarm(entity=entity_id, alarm=alarm,
+                                    criteria=criteria, disabled=disabled,
+                                    label=label, metadata=metadata)
                 changed = True
 
             if should_delete:
-                alarm.delete()
+                if not module.check_mode:
+                    alarm.delete()
                 changed = True
         else:
             should_create = True
 
         if should_create:
-            alarm = cm.create_alarm(entity=entity_id, check=check_id,
-                                    notification_plan=notification_plan_id,
-                                    criteria=criteria, disabled=disabled, label=label,
-                                    metadata=metadata)
+            if not module.check_mode:
+                alarm = cm.create_alarm(entity=entity_id, check=check_id,
+                                        notification_plan=notification_plan_id,
+                                        criteria=criteria, disabled=disabled, label=label,
+                                        metadata=metadata)
             changed = True
     else:
         for a in existing:
-            a.delete()
+            if not module.check_mode:
+                a.delete()
             changed = True
 
     if alarm:
@@ -202,7 +206,8 @@ def main():
 
     module = AnsibleModule(
         argument_spec=argument_spec,
-        required_together=rax_required_together()
+        required_together=rax_required_together(),
+        supports_check_mode=True
     )
 
     if not HAS_PYRAX:
@@ -0,0 +1,270 @@
+from nose.plugins.skip import SkipTest
+
+try:
+    import boto.vpc
+    HAS_BOTO = True
+except ImportError:
+    HAS_BOTO = False
+
+if not HAS_BOTO:
+    raise SkipTest("test_ec2_vpc_route_table.py requires the python module 'boto'")
+
+from boto.exception import EC2ResponseError
+
+from ansible.compat.tests import unittest
+from ansible.compat.tests.mock import MagicMock
+
+import ansible.modules.cloud.amazon.ec2_vpc_route_table as rt
+
+
+def make_ec2_error(error_code):
+    error = EC2ResponseError(400, 'Bad Request')
+    error.error_code = error_code
+    return error
+
+
+def make_association(association_id, subnet_id):
+    return MagicMock(id=association_id, subnet_id=subnet_id)
+
+
+def make_subnet(subnet_id, cidr_block, name=None):
+    tags = {}
+    if name is not None:
+        tags['Name'] = name
+    return MagicMock(id=subnet_id, cidr_block=cidr_block, tags=tags)
+
+
+def make_route(destination_cidr_block, gateway_id=None, instance_id=None,
+               interface_id=None, vpc_peering_connection_id=None):
+    return MagicMock(destination_cidr_block=destination_cidr_block,
+                     gateway_id=gateway_id, instance_id=instance_id,
+                     interface_id=interface_id,
+                     vpc_peering_connection_id=vpc_peering_connection_id)
+
+
+def make_route_table(route_table_id, associations=None, routes=None):
+    return MagicMock(id=route_table_id, associations=associations or [],
+                     routes=routes or [])
+
+
+class AnsibleEc2VpcRouteTableFunctions(unittest.TestCase):
+
+    def test_ensure_subnet_associations_duplicate_subnet(self):
+        old_table = make_route_table('rtb-old', [make_association('a-old', 'subnet-1')])
+        route_table = make_route_table('rtb-1')
+        subnet = MagicMock(id='subnet-1')
+
+        vpc_conn = MagicMock()
+        vpc_conn.get_all_route_tables.return_value = [old_table, route_table]
+        vpc_conn.associate_route_table.return_value = 'a-new'
+
+        result = rt.ensure_subnet_associations(
+            vpc_conn, 'vpc-1', route_table, [subnet, subnet], check_mode=False)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(vpc_conn.get_all_route_tables.call_count, 1)
+        vpc_conn.disassociate_route_table.assert_called_once_with('a-old')
+        vpc_conn.associate_route_table.assert_called_once_with('rtb-1', 'subnet-1')
+
+    def test_ensure_subnet_associations_already_associated(self):
+        route_table = make_route_table('rtb-1', [make_association('a-1', 'subnet-1')])
+        subnet = MagicMock(id='subnet-1')
+        vpc_conn = MagicMock()
+
+        result = rt.ensure_subnet_associations(
+            vpc_conn, 'vpc-1', route_table, [subnet], check_mode=False)
+
+        self.assertFalse(result['changed'])
+        self.assertFalse(vpc_conn.get_all_route_tables.called)
+        self.assertFalse(vpc_conn.associate_route_table.called)
+        self.assertFalse(vpc_conn.disassociate_route_table.called)
+
+    def test_ensure_subnet_associations_check_mode(self):
+        route_table = make_route_table('rtb-1')
+        subnet = MagicMock(id='subnet-1')
+        vpc_conn = MagicMock()
+        vpc_conn.get_all_route_tables.return_value = [route_table]
+
+        result = rt.ensure_subnet_associations(
+            vpc_conn, 'vpc-1', route_table, [subnet], check_mode=True)
+
+        self.assertTrue(result['changed'])
+        self.assertFalse(vpc_conn.associate_route_table.called)
+
+    def test_ensure_tags_updates_changed_value(self):
+        vpc_conn = MagicMock()
+
+        result = rt.ensure_tags(vpc_conn, 'rtb-1', {'Name': 'new'},
+                                add_only=True, check_mode=False,
+                                cur_tags={'Name': 'old', 'Env': 'prod'})
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['tags'], {'Name': 'new', 'Env': 'prod'})
+        vpc_conn.create_tags.assert_called_once_with('rtb-1', {'Name': 'new'}, dry_run=False)
+        self.assertFalse(vpc_conn.delete_tags.called)
+
+    def test_ensure_tags_add_only_unchanged(self):
+        vpc_conn = MagicMock()
+
+        result = rt.ensure_tags(vpc_conn, 'rtb-1', {'Name': 'a'},
+                                add_only=True, check_mode=False,
+                                cur_tags={'Name': 'a', 'Env': 'prod'})
+
+        self.assertFalse(result['changed'])
+        self.assertFalse(vpc_conn.get_all_tags.called)
+        self.assertFalse(vpc_conn.create_tags.called)
+        self.assertFalse(vpc_conn.delete_tags.called)
+
+    def test_ensure_tags_check_mode(self):
+        vpc_conn = MagicMock()
+        vpc_conn.create_tags.side_effect = make_ec2_error('DryRunOperation')
+
+        result = rt.ensure_tags(vpc_conn, 'rtb-1', {'Name': 'new'},
+                                add_only=True, check_mode=True,
+                                cur_tags={'Name': 'old'})
+
+        self.assertTrue(result['changed'])
+        vpc_conn.create_tags.assert_called_once_with('rtb-1', {'Name': 'new'}, dry_run=True)
+
+    def test_ensure_tags_error(self):
+        vpc_conn = MagicMock()
+        vpc_conn.create_tags.side_effect = make_ec2_error('UnauthorizedOperation')
+
+        self.assertRaises(rt.AnsibleTagCreationException, rt.ensure_tags,
+                          vpc_conn, 'rtb-1', {'Name': 'new'}, add_only=True,
+                          check_mode=False, cur_tags={})
+
+    def test_ensure_routes_ignores_routes_without_cidr(self):
+        # boto does not parse IPv6 destinations, so such routes have no CIDR
+        route_table = make_route_table('rtb-1', routes=[
+            make_route('10.0.0.0/16', gateway_id='local'),
+            make_route(None, gateway_id='igw-1'),
+            make_route(None, gateway_id='eigw-1'),
+        ])
+        vpc_conn = MagicMock()
+
+        result = rt.ensure_routes(vpc_conn, route_table, [], None,
+                                  check_mode=False)
+
+        self.assertFalse(result['changed'])
+        self.assertFalse(vpc_conn.delete_route.called)
+        self.assertFalse(vpc_conn.create_route.called)
+
+    def test_ensure_routes_collects_errors(self):
+        route_table = make_route_table('rtb-1', routes=[
+            make_route('10.1.0.0/16', gateway_id='igw-old'),
+            make_route('10.2.0.0/16', gateway_id='igw-old'),
+        ])
+        route_specs = [
+            {'destination_cidr_block': '0.0.0.0/0', 'gateway_id': 'igw-1'},
+            {'destination_cidr_block': '10.3.0.0/16', 'gateway_id': 'igw-1'},
+        ]
+        delete_errors = {'10.1.0.0/16': 'InvalidRoute.NotFound',
+                         '10.2.0.0/16': 'DryRunOperation'}
+        create_errors = {'0.0.0.0/0': 'RouteAlreadyExists',
+                         '10.3.0.0/16': 'DryRunOperation'}
+
+        def delete_route(route_table_id, destination_cidr_block, dry_run):
+            raise make_ec2_error(delete_errors[destination_cidr_block])
+
+        def create_route(route_table_id, dry_run, destination_cidr_block, **kwargs):
+            raise make_ec2_error(create_errors[destination_cidr_block])
+
+        vpc_conn = MagicMock()
+        vpc_conn.delete_route.side_effect = delete_route
+        vpc_conn.create_route.side_effect = create_route
+
+        with self.assertRaises(rt.AnsibleRouteTableException) as ctx:
+            rt.ensure_routes(vpc_conn, route_table, route_specs, None,
+                             check_mode=False)
+
+        msg = str(ctx.exception)
+        self.assertIn('Unable to delete route 10.1.0.0/16', msg)
+        self.assertIn('Unable to create route 0.0.0.0/0', msg)
+        self.assertNotIn('10.2.0.0/16', msg)
+        self.assertNotIn('10.3.0.0/16', msg)
+        self.assertEqual(vpc_conn.delete_route.call_count, 2)
+        self.assertEqual(vpc_conn.create_route.call_count, 2)
+
+    def test_ensure_propagation_enables_remaining_vgws(self):
+        route_table = make_route_table('rtb-1', routes=[
+            make_route('10.0.0.0/16', gateway_id='local'),
+            make_route('192.168.0.0/16', gateway_id='vgw-1'),
+        ])
+        vpc_conn = MagicMock()
+
+        result = rt.ensure_propagation(vpc_conn, route_table,
+                                       ['vgw-1', 'vgw-2'], check_mode=False)
+
+        self.assertTrue(result['changed'])
+        vpc_conn.enable_vgw_route_propagation.assert_called_once_with(
+            'rtb-1', 'vgw-2', dry_run=False)
+
+    def test_ensure_propagation_check_mode(self):
+        route_table = make_route_table('rtb-1')
+        vpc_conn = MagicMock()
+        vpc_conn.enable_vgw_route_propagation.side_effect = make_ec2_error('DryRunOperation')
+
+        result = rt.ensure_propagation(vpc_conn, route_table, ['vgw-1'],
+                                       check_mode=True)
+
+        self.assertTrue(result['changed'])
+        vpc_conn.enable_vgw_route_propagation.assert_called_once_with(
+            'rtb-1', 'vgw-1', dry_run=True)
+
+    def test_ensure_propagation_collects_errors(self):
+        route_table = make_route_table('rtb-1')
+        vpc_conn = MagicMock()
+        vpc_conn.enable_vgw_route_propagation.side_effect = make_ec2_error('InvalidVpnGatewayID.NotFound')
+
+        with self.assertRaises(rt.AnsibleRouteTableException) as ctx:
+            rt.ensure_propagation(vpc_conn, route_table, ['vgw-1', 'vgw-2'],
+                                  check_mode=False)
+
+        msg = str(ctx.exception)
+        self.assertIn('vgw-1', msg)
+        self.assertIn('vgw-2', msg)
+        self.assertEqual(vpc_conn.enable_vgw_route_propagation.call_count, 2)
+
+    def make_subnet_conn(self):
+        vpc_conn = MagicMock()
+        vpc_conn.get_all_subnets.return_value = [
+            make_subnet('subnet-1', '10.0.1.0/24', 'web'),
+            make_subnet('subnet-2', '10.0.2.0/24', 'db'),
+            make_subnet('subnet-3', '10.0.3.0/24', 'shared'),
+            make_subnet('subnet-4', '10.0.4.0/24', 'shared'),
+        ]
+        return vpc_conn
+
+    def test_find_subnets_single_describe(self):
+        vpc_conn = self.make_subnet_conn()
+
+        subnets = rt.find_subnets(vpc_conn, 'vpc-1',
+                                  ['db', '10.0.1.0/24', 'subnet-4'])
+
+        self.assertEqual([s.id for s in subnets],
+                         ['subnet-4', 'subnet-1', 'subnet-2'])
+        vpc_conn.get_all_subnets.assert_called_once_with(
+            filters={'vpc_id': 'vpc-1'})
+
+    def test_find_subnets_missing(self):
+        for identifier in ('subnet-9', '10.0.9.0/24', 'missing'):
+            vpc_conn = self.make_subnet_conn()
+            with self.assertRaises(rt.AnsibleSubnetSearchException) as ctx:
+                rt.find_subnets(vpc_conn, 'vpc-1', ['web', identifier])
+            self.assertIn('"{0}" does not exist'.format(identifier),
+                          str(ctx.exception))
+
+    def test_find_subnets_duplicate_name(self):
+        vpc_conn = self.make_subnet_conn()
+
+        with self.assertRaises(rt.AnsibleSubnetSearchException) as ctx:
+            rt.find_subnets(vpc_conn, 'vpc-1', ['shared'])
+
+        self.assertIn('Multiple subnets named "shared"', str(ctx.exception))
+
+    def test_find_subnets_empty(self):
+        for identified_subnets in ([], None):
+            vpc_conn = MagicMock()
+            self.assertEqual(rt.find_subnets(vpc_conn, 'vpc-1', identified_subnets), [])
+            self.assertFalse(vpc_conn.get_all_subnets.called)